@@ -6,6 +6,8 @@ Usage: python3 create_admin_users.py
 
 import requests
 import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 def create_admin_users():
     base_url = 'http://localhost:3001/api'
@@ -41,34 +43,41 @@ def create_admin_users():
     print("Creating admin users...")
     print("=" * 50)
     
-    for admin in admins:
-        try:
-            response = requests.post(
-                f'{base_url}/auth/admin/create-admin',
-                json=admin,
-                headers={'Content-Type': 'application/json'}
-            )
-            
-            if response.status_code == 200:
-                user_data = response.json()
-                print(f'✅ Admin {admin["username"]} created successfully')
-                print(f'   Email: {user_data["email"]}')
-                print(f'   Full Name: {user_data["full_name"]}')
-                print(f'   Role: {user_data["role"]}')
-                print()
-            else:
-                print(f'❌ Failed to create admin {admin["username"]}: {response.status_code}')
-                print(f'   Error: {response.text}')
-                print()
+    # One pooled session for all calls; connection failures are retried with backoff
+    session = requests.Session()
+    retries = Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504])
+    adapter = HTTPAdapter(max_retries=retries)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    
+    with session:
+        for admin in admins:
+            try:
+                response = session.post(
+                    f'{base_url}/auth/admin/create-admin',
+                    json=admin
+                )
                 
-        except requests.exceptions.ConnectionError:
-            print(f'❌ Cannot connect to server. Please start the server first:')
-            print(f'   cd /home/benedikt.thomas/projekte/kanbanboard/backend')
-            print(f'   uvicorn server:app --reload')
-            break
-        except Exception as e:
-            print(f'❌ Error creating admin {admin["username"]}: {str(e)}')
-            print()
+                if response.status_code == 200:
+                    user_data = response.json()
+                    print(f'✅ Admin {admin["username"]} created successfully')
+                    print(f'   Email: {user_data["email"]}')
+                    print(f'   Full Name: {user_data["full_name"]}')
+                    print(f'   Role: {user_data["role"]}')
+                    print()
+                else:
+                    print(f'❌ Failed to create admin {admin["username"]}: {response.status_code}')
+                    print(f'   Error: {response.text}')
+                    print()
+                    
+            except requests.exceptions.ConnectionError:
+                print(f'❌ Cannot connect to server. Please start the server first:')
+                print(f'   cd /home/benedikt.thomas/projekte/kanbanboard/backend')
+                print(f'   uvicorn server:app --reload')
+                break
+            except Exception as e:
+                print(f'❌ Error creating admin {admin["username"]}: {str(e)}')
+                print()
 
 if __name__ == "__main__":
     create_admin_users()
\ No newline at end of file
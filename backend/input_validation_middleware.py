@@ -140,6 +140,7 @@ class ValidationMiddleware(BaseHTTPMiddleware):
             '/api/auth/login': self._validate_login,
             '/api/auth/register': self._validate_registration,
             '/api/tasks': self._validate_task_data,
+            '/api/tasks/bulk': self._validate_bulk_task_data,
             '/api/projects': self._validate_project_data,
             '/api/chat/messages': self._validate_chat_message,
         }
@@ -261,6 +262,22 @@ class ValidationMiddleware(BaseHTTPMiddleware):
         
         return {'valid': len(errors) == 0, 'errors': errors}
     
+    def _validate_bulk_task_data(self, data: Any) -> Dict[str, Any]:
+        """Validate each task of a bulk create request with the single-task rules."""
+        errors = []
+        
+        # Non-list bodies and non-object items are rejected by the route's schema
+        if not isinstance(data, list):
+            return {'valid': True, 'errors': errors}
+        
+        for index, task in enumerate(data):
+            if not isinstance(task, dict):
+                continue
+            result = self._validate_task_data(task)
+            errors.extend(f"Task {index}: {error}" for error in result['errors'])
+        
+        return {'valid': len(errors) == 0, 'errors': errors}
+    
     def _validate_project_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Validate project data."""
         errors = []
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Fast JSON request routing for the Kanban Board application.
+Decodes request bodies with orjson instead of the stdlib json module.
+"""
+
+from typing import Any, Callable
+
+import orjson
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+
+
+class ORJSONRequest(Request):
+    """
+    Request whose JSON body is parsed with orjson.
+    """
+
+    async def json(self) -> Any:
+        """Parse the request body once and cache the result."""
+        if not hasattr(self, "_json"):
+            self._json = orjson.loads(await self.body())
+        return self._json
+
+
+class ORJSONRoute(APIRoute):
+    """
+    API route that hands its endpoint an ORJSONRequest, so FastAPI's body
+    parsing goes through orjson before Pydantic validation.
+    """
+
+    def get_route_handler(self) -> Callable:
+        original_route_handler = super().get_route_handler()
+
+        async def orjson_route_handler(request: Request) -> Response:
+            request = ORJSONRequest(request.scope, request.receive)
+            return await original_route_handler(request)
+
+        return orjson_route_handler
+
+
+# Export request and route classes
+__all__ = [
+    'ORJSONRequest',
+    'ORJSONRoute'
+]
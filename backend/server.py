@@ -1,14 +1,17 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, status, Request
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, Query, status, Request
+from fastapi.responses import ORJSONResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
 import os
+import asyncio
 import logging
 from pathlib import Path
 from pydantic import BaseModel, Field
 from typing import List, Optional
 import uuid
+from collections import Counter
 from datetime import datetime, timedelta
 import jwt
 from passlib.context import CryptContext
@@ -35,6 +38,9 @@ from security_middleware import (
     configure_security_middleware
 )
 
+# Import fast JSON request routing
+from json_routing import ORJSONRoute
+
 # Import input validation
 from input_validation_middleware import configure_input_validation
 from simple_validation_schemas import (
@@ -58,18 +64,19 @@ SECRET_KEY = settings.secret_key
 ALGORITHM = settings.algorithm
 ACCESS_TOKEN_EXPIRE_MINUTES = settings.access_token_expire_minutes
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.bcrypt_rounds)
 security = HTTPBearer()
 
 # Create the main app without a prefix
 app = FastAPI(
     title=settings.app_name,
     version=settings.app_version,
-    debug=settings.debug
+    debug=settings.debug,
+    default_response_class=ORJSONResponse
 )
 
 # Create a router with the /api prefix
-api_router = APIRouter(prefix="/api")
+api_router = APIRouter(prefix="/api", route_class=ORJSONRoute)
 
 # Root endpoint
 @app.get("/")
@@ -89,11 +96,20 @@ async def root():
 N8N_WEBHOOK_URL = settings.n8n_webhook_url
 N8N_API_KEY = os.environ.get('N8N_API_KEY', '')
 
+# Shared HTTP client for N8N calls, so connections are kept alive between requests
+n8n_client = httpx.AsyncClient(
+    limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+    timeout=httpx.Timeout(30.0, connect=5.0)
+)
+
 # Registration Configuration
 REGISTRATION_MODE = os.environ.get('REGISTRATION_MODE', 'admin_only')  # open, admin_only, invitation
 ADMIN_REGISTRATION_KEY = settings.registration_key
 SUPER_ADMIN_KEY = settings.super_admin_key
 
+# Maximum number of tasks accepted by the bulk create endpoint
+MAX_BULK_TASKS = 100
+
 # No predefined users - only admin accounts created via API
 USERS = {}
 
@@ -336,24 +352,29 @@ async def call_n8n_workflow(message: str, user_context: dict) -> str:
         if N8N_WEBHOOK_URL == 'https://your-n8n-instance.com/webhook/chatbot':
             return f"AI Assistant: I'd be happy to help you with your question: '{message}'. I can assist with task management, project planning, and team coordination. Please connect me to your N8N workflow to enable full AI capabilities."
         
-        async with httpx.AsyncClient() as client:
-            headers = {
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {N8N_API_KEY}" if N8N_API_KEY else None
-            }
-            
-            response = await client.post(
-                N8N_WEBHOOK_URL,
-                json=payload,
-                headers=headers,
-                timeout=30.0
-            )
-            
-            if response.status_code == 200:
+        headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {N8N_API_KEY}" if N8N_API_KEY else None
+        }
+        
+        response = await n8n_client.post(
+            N8N_WEBHOOK_URL,
+            json=payload,
+            headers=headers
+        )
+        
+        if response.status_code == 200:
+            # An empty body carries no response; skip decoding it
+            if not response.content:
+                return "I'm here to help!"
+            try:
                 result = response.json()
-                return result.get("response", "I'm here to help!")
-            else:
-                return "I'm temporarily unavailable. Please try again later."
+            except ValueError:
+                logging.error("N8N workflow returned a non-JSON response")
+                return "I'm experiencing technical difficulties. Please try again."
+            return result.get("response", "I'm here to help!")
+        else:
+            return "I'm temporarily unavailable. Please try again later."
                 
     except Exception as e:
         logging.error(f"Error calling N8N workflow: {str(e)}")
@@ -539,10 +560,13 @@ async def get_registration_config():
 
 # Chat Routes
 @api_router.get("/chat/messages", response_model=List[ChatMessageResponse])
-async def get_chat_messages(current_user: User = Depends(get_current_user)):
+async def get_chat_messages(
+    limit: int = Query(50, ge=1, le=50),
+    current_user: User = Depends(get_current_user)
+):
     messages = await db.chat_messages.find(
         {"user_id": current_user.id}
-    ).sort("timestamp", -1).limit(50).to_list(50)
+    ).sort("timestamp", -1).limit(limit).to_list(limit)
     
     return [ChatMessageResponse(**msg) for msg in reversed(messages)]
 
@@ -562,18 +586,18 @@ async def send_chat_message(
         is_ai=False
     )
     
-    # Save user message
-    await db.chat_messages.insert_one(user_message.dict())
-    
-    # Get AI response from N8N
-    ai_response = await call_n8n_workflow(
-        message.message,
-        {
-            "id": current_user.id,
-            "name": current_user.full_name,
-            "role": current_user.role,
-            "avatar": current_user.avatar
-        }
+    # Save user message and get AI response from N8N concurrently
+    _, ai_response = await asyncio.gather(
+        db.chat_messages.insert_one(user_message.dict()),
+        call_n8n_workflow(
+            message.message,
+            {
+                "id": current_user.id,
+                "name": current_user.full_name,
+                "role": current_user.role,
+                "avatar": current_user.avatar
+            }
+        )
     )
     
     # Create AI response message
@@ -597,8 +621,11 @@ async def clear_chat_messages(current_user: User = Depends(get_current_user)):
 
 # Project Routes
 @api_router.get("/projects", response_model=List[Project])
-async def get_projects(current_user: User = Depends(get_current_user)):
-    projects = await db.projects.find({"user_id": current_user.id}).to_list(1000)
+async def get_projects(
+    limit: int = Query(1000, ge=1, le=1000),
+    current_user: User = Depends(get_current_user)
+):
+    projects = await db.projects.find({"user_id": current_user.id}).limit(limit).to_list(limit)
     return [Project(**project) for project in projects]
 
 @api_router.post("/projects", response_model=Project)
@@ -638,8 +665,11 @@ async def delete_project(project_id: str, current_user: User = Depends(get_curre
 
 # Task Routes
 @api_router.get("/tasks", response_model=List[Task])
-async def get_tasks(current_user: User = Depends(get_current_user)):
-    tasks = await db.tasks.find({"user_id": current_user.id}).to_list(1000)
+async def get_tasks(
+    limit: int = Query(1000, ge=1, le=1000),
+    current_user: User = Depends(get_current_user)
+):
+    tasks = await db.tasks.find({"user_id": current_user.id}).limit(limit).to_list(limit)
     return [Task(**task) for task in tasks]
 
 @api_router.post("/tasks", response_model=Task)
@@ -652,6 +682,23 @@ async def create_task(request: Request, task: TaskCreate, current_user: User = D
     await db.tasks.insert_one(task_obj.dict())
     return task_obj
 
+@api_router.post("/tasks/bulk", response_model=List[Task])
+@limiter.limit(settings.api_rate_limit)
+async def create_tasks_bulk(request: Request, tasks: List[TaskCreate], current_user: User = Depends(get_current_user)):
+    if not tasks:
+        raise HTTPException(status_code=400, detail="No tasks provided")
+    if len(tasks) > MAX_BULK_TASKS:
+        raise HTTPException(status_code=400, detail=f"Too many tasks (max {MAX_BULK_TASKS})")
+    
+    task_objs = []
+    for task in tasks:
+        task_dict = task.dict()
+        task_dict["created_by"] = current_user.id
+        task_dict["user_id"] = current_user.id
+        task_objs.append(Task(**task_dict))
+    await db.tasks.insert_many([task_obj.dict() for task_obj in task_objs])
+    return task_objs
+
 @api_router.put("/tasks/{task_id}", response_model=Task)
 async def update_task(task_id: str, task_update: TaskUpdate, current_user: User = Depends(get_current_user)):
     update_data = {k: v for k, v in task_update.dict().items() if v is not None}
@@ -680,33 +727,41 @@ async def delete_task(task_id: str, current_user: User = Depends(get_current_use
 # Analytics Routes
 @api_router.get("/analytics/dashboard")
 async def get_dashboard_analytics(current_user: User = Depends(get_current_user)):
-    # Get task statistics
-    tasks = await db.tasks.find({"user_id": current_user.id}).to_list(1000)
-    projects = await db.projects.find({"user_id": current_user.id}).to_list(1000)
+    # Get tasks and projects concurrently
+    tasks, projects = await asyncio.gather(
+        db.tasks.find({"user_id": current_user.id}).to_list(1000),
+        db.projects.find({"user_id": current_user.id}).to_list(1000)
+    )
+    
+    # Count statuses and priorities in a single pass each
+    task_status_counts = Counter(t["status"] for t in tasks)
+    task_priority_counts = Counter(t["priority"] for t in tasks)
+    project_status_counts = Counter(p["status"] for p in projects)
     
     # Task statistics
+    now = datetime.now()
     task_stats = {
         "total_tasks": len(tasks),
-        "todo": len([t for t in tasks if t["status"] == "todo"]),
-        "inprogress": len([t for t in tasks if t["status"] == "inprogress"]),
-        "testing": len([t for t in tasks if t["status"] == "testing"]),
-        "completed": len([t for t in tasks if t["status"] == "completed"]),
-        "overdue": len([t for t in tasks if t.get("deadline") and t["deadline"] and datetime.fromisoformat(str(t["deadline"]).replace("Z", "+00:00")) < datetime.now()]),
+        "todo": task_status_counts["todo"],
+        "inprogress": task_status_counts["inprogress"],
+        "testing": task_status_counts["testing"],
+        "completed": task_status_counts["completed"],
+        "overdue": len([t for t in tasks if t.get("deadline") and t["deadline"] and datetime.fromisoformat(str(t["deadline"]).replace("Z", "+00:00")) < now]),
     }
     
     # Priority distribution
     priority_stats = {
-        "P1": len([t for t in tasks if t["priority"] == "P1"]),
-        "P2": len([t for t in tasks if t["priority"] == "P2"]),
-        "P3": len([t for t in tasks if t["priority"] == "P3"]),
-        "P4": len([t for t in tasks if t["priority"] == "P4"]),
+        "P1": task_priority_counts["P1"],
+        "P2": task_priority_counts["P2"],
+        "P3": task_priority_counts["P3"],
+        "P4": task_priority_counts["P4"],
     }
     
     # Project statistics
     project_stats = {
         "total_projects": len(projects),
-        "active_projects": len([p for p in projects if p["status"] == "active"]),
-        "completed_projects": len([p for p in projects if p["status"] == "completed"]),
+        "active_projects": project_status_counts["active"],
+        "completed_projects": project_status_counts["completed"],
     }
     
     return {
@@ -744,4 +799,5 @@ async def startup_db():
 
 @app.on_event("shutdown")
 async def shutdown_db_client():
-    client.close()
\ No newline at end of file
+    client.close()
+    await n8n_client.aclose()
\ No newline at end of file
@@ -19,6 +19,7 @@ class Settings:
         self.secret_key: str = os.getenv("SECRET_KEY", "fallback-development-key-change-in-production")
         self.algorithm: str = "HS256"
         self.access_token_expire_minutes: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "60"))  # 1 hour default
+        self.bcrypt_rounds: int = int(os.getenv("BCRYPT_ROUNDS", "12"))  # log2 work factor for new password hashes
         
         # Database Settings
         self.mongodb_url: str = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
@@ -24,7 +24,7 @@ class ValidationConfig:
     MAX_TAG_LENGTH = 50
     MAX_TAGS_COUNT = 10
     
-    EMAIL_PATTERN = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
+    EMAIL_PATTERN = r'^[a-zA-Z0-9._%+-]+@(?:[a-zA-Z0-9-]+\.)+[a-zA-Z]{2,}$'
     USERNAME_PATTERN = r'^[a-zA-Z0-9._-]+$'
 
 
@@ -55,6 +55,11 @@ class ProjectStatus(str, Enum):
     ARCHIVED = "archived"
 
 
+# Null bytes and control characters (tab, newline and carriage return are
+# left for whitespace normalization)
+_CONTROL_CHARS_RE = re.compile(r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]')
+
+
 def sanitize_string(value: str) -> str:
     """Basic string sanitization."""
     if not value:
@@ -73,9 +78,9 @@ def sanitize_string(value: str) -> str:
     for pattern in dangerous_patterns:
         value = re.sub(pattern, '', value, flags=re.IGNORECASE)
     
-    # Remove null bytes and control characters
-    value = value.replace('\x00', '')
-    value = re.sub(r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]', '', value)
+    # Remove null bytes and control characters; printable strings have none
+    if not value.isprintable():
+        value = _CONTROL_CHARS_RE.sub('', value)
     
     # Normalize whitespace
     value = re.sub(r'\s+', ' ', value).strip()
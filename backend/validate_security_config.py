@@ -5,8 +5,12 @@ Validate security configuration without running server.
 
 from settings import settings
 from security_middleware import SecurityHeadersMiddleware
+from urllib.parse import urlsplit
 import re
 
+# URL schemes accepted for CORS origins
+_VALID_SCHEMES = frozenset({'http', 'https'})
+
 def validate_cors_config():
     """Validate CORS configuration."""
     print("🔒 Validating CORS Configuration...")
@@ -19,7 +23,11 @@ def validate_cors_config():
     
     valid_origins = 0
     for origin in origins:
-        if origin.startswith(('http://', 'https://')):
+        try:
+            parts = urlsplit(origin)
+        except ValueError:  # e.g. an unclosed IPv6 bracket
+            parts = None
+        if parts and parts.scheme in _VALID_SCHEMES and parts.netloc:
             valid_origins += 1
             print(f"  ✅ Valid origin: {origin}")
         else:
@@ -103,6 +111,12 @@ def validate_settings():
     else:
         print(f"  ✅ Token expiration: {settings.access_token_expire_minutes} minutes")
     
+    # Check password hashing cost (low values are only meant for test deployments)
+    if settings.bcrypt_rounds < 12:
+        issues.append(f"bcrypt rounds too low: {settings.bcrypt_rounds}")
+    else:
+        print(f"  ✅ bcrypt rounds: {settings.bcrypt_rounds}")
+    
     # Check debug mode
     if settings.debug:
         issues.append("Debug mode is enabled (should be false in production)")
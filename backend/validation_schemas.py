@@ -7,7 +7,7 @@ Provides strict input validation and sanitization.
 import re
 from typing import Optional, List, Dict, Any
 from datetime import datetime
-from pydantic import BaseModel, Field, field_validator, model_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator, validator
 from enum import Enum
 
 
@@ -28,7 +28,7 @@ class ValidationConfig:
     MAX_TAGS_COUNT = 10
     
     # Regex patterns
-    EMAIL_PATTERN = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
+    EMAIL_PATTERN = r'^[a-zA-Z0-9._%+-]+@(?:[a-zA-Z0-9-]+\.)+[a-zA-Z]{2,}$'
     USERNAME_PATTERN = r'^[a-zA-Z0-9._-]+$'
     COLOR_PATTERN = r'^#?[a-fA-F0-9]{6}$|^(red|blue|green|yellow|purple|orange|pink|gray|teal|indigo)$'
     URL_PATTERN = r'^https?://(?:[-\w.])+(?:\:[0-9]+)?(?:/(?:[\w/_.])*(?:\?(?:[\w&=%.])*)?(?:\#(?:[\w.])*)?)?$'
@@ -98,21 +98,69 @@ class UserRole(str, Enum):
     VIEWER = "viewer"
 
 
+# Private-use code point that sanitize_string leaves intact, used to
+# sanitize a list of tags as a single string.
+_TAG_SEPARATOR = '\ue000'
+
+# Compiled patterns for the user validators
+_USERNAME_RE = re.compile(ValidationConfig.USERNAME_PATTERN)
+_PASSWORD_CHAR_RE = re.compile(r'[0-9!@#$%^&*(),.?":{}|<>]')
+
+# Passwords rejected as too common
+_COMMON_PASSWORDS = frozenset({'password', '123456', 'qwerty', 'admin', 'user'})
+
+
+# Null bytes and control characters (tab, newline and carriage return are
+# left for whitespace normalization)
+_CONTROL_CHARS_RE = re.compile(r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]')
+
+
+# Dangerous patterns, applied in order. The patterns are lowercase, so ASCII
+# input is matched against a lowercased copy; other input needs IGNORECASE,
+# which also folds characters such as U+017F onto ASCII letters.
+_DANGEROUS_PATTERNS = ValidationConfig.XSS_PATTERNS + ValidationConfig.SQL_INJECTION_PATTERNS
+_DANGEROUS_RES = [re.compile(pattern) for pattern in _DANGEROUS_PATTERNS]
+_DANGEROUS_IGNORECASE_RES = [re.compile(pattern, re.IGNORECASE) for pattern in _DANGEROUS_PATTERNS]
+
+
+def _splice_out(value: str, spans: List[tuple]) -> str:
+    """Remove the given (start, end) spans from a string."""
+    parts = []
+    last = 0
+    for start, end in spans:
+        parts.append(value[last:start])
+        last = end
+    parts.append(value[last:])
+    return ''.join(parts)
+
+
+def _remove_dangerous_patterns(value: str) -> str:
+    """Remove XSS and SQL injection patterns, ignoring case."""
+    if not value.isascii():
+        for regex in _DANGEROUS_IGNORECASE_RES:
+            value = regex.sub('', value)
+        return value
+    
+    lowered = value.lower()
+    for regex in _DANGEROUS_RES:
+        spans = [match.span() for match in regex.finditer(lowered)]
+        if spans:
+            value = _splice_out(value, spans)
+            lowered = _splice_out(lowered, spans)
+    return value
+
+
 def sanitize_string(value: str) -> str:
     """Sanitize string input to prevent XSS and injection attacks."""
     if not value:
         return value
     
     # Remove dangerous patterns
-    for pattern in ValidationConfig.XSS_PATTERNS:
-        value = re.sub(pattern, '', value, flags=re.IGNORECASE)
+    value = _remove_dangerous_patterns(value)
     
-    for pattern in ValidationConfig.SQL_INJECTION_PATTERNS:
-        value = re.sub(pattern, '', value, flags=re.IGNORECASE)
-    
-    # Remove null bytes and control characters
-    value = value.replace('\x00', '')
-    value = re.sub(r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]', '', value)
+    # Remove null bytes and control characters; printable strings have none
+    if not value.isprintable():
+        value = _CONTROL_CHARS_RE.sub('', value)
     
     # Normalize whitespace
     value = re.sub(r'\s+', ' ', value).strip()
@@ -127,36 +175,37 @@ def validate_no_html(value: str) -> str:
     return value
 
 
+# Path traversal, absolute paths and invalid filename characters
+_UNSAFE_FILENAME_RE = re.compile(
+    r'\.\.[/\\]'     # Path traversal (POSIX and Windows)
+    r'|^[/\\]'       # Absolute path (POSIX and Windows)
+    r'|[<>:"|?*]'    # Invalid filename characters
+)
+
+
 def validate_safe_filename(value: str) -> str:
     """Validate filename is safe."""
     if not value:
         return value
     
     # Check for dangerous patterns
-    dangerous_patterns = [
-        r'\.\./',  # Path traversal
-        r'\.\.\\',  # Path traversal (Windows)
-        r'^/',     # Absolute path
-        r'^\\',    # Absolute path (Windows)
-        r'[<>:"|?*]',  # Invalid filename characters
-    ]
-    
-    for pattern in dangerous_patterns:
-        if re.search(pattern, value):
-            raise ValueError("Unsafe filename")
+    if _UNSAFE_FILENAME_RE.search(value):
+        raise ValueError("Unsafe filename")
     
     return value
 
 
 class EnhancedUserLogin(BaseModel):
     """Enhanced user login validation."""
+    model_config = ConfigDict(extra='forbid')
+    
     username: str = Field(..., min_length=ValidationConfig.MIN_USERNAME_LENGTH, max_length=ValidationConfig.MAX_USERNAME_LENGTH)
     password: str = Field(..., min_length=ValidationConfig.MIN_PASSWORD_LENGTH, max_length=ValidationConfig.MAX_PASSWORD_LENGTH)
     
     def model_post_init(self, __context):
         """Post-init validation."""
         self.username = sanitize_string(self.username)
-        if not re.match(ValidationConfig.USERNAME_PATTERN, self.username):
+        if not _USERNAME_RE.match(self.username):
             raise ValueError("Username can only contain letters, numbers, dots, underscores, and hyphens")
         
         if len(self.password) < ValidationConfig.MIN_PASSWORD_LENGTH:
@@ -165,6 +214,8 @@ class EnhancedUserLogin(BaseModel):
 
 class EnhancedUserRegistration(BaseModel):
     """Enhanced user registration validation."""
+    model_config = ConfigDict(extra='forbid')
+    
     username: str = Field(..., min_length=ValidationConfig.MIN_USERNAME_LENGTH, max_length=ValidationConfig.MAX_USERNAME_LENGTH)
     email: str = Field(..., max_length=ValidationConfig.MAX_EMAIL_LENGTH)
     password: str = Field(..., min_length=ValidationConfig.MIN_PASSWORD_LENGTH, max_length=ValidationConfig.MAX_PASSWORD_LENGTH)
@@ -174,7 +225,7 @@ class EnhancedUserRegistration(BaseModel):
     @validator('username')
     def validate_username(cls, v):
         v = sanitize_string(v)
-        if not re.match(ValidationConfig.USERNAME_PATTERN, v):
+        if not _USERNAME_RE.match(v):
             raise ValueError("Username can only contain letters, numbers, dots, underscores, and hyphens")
         return v
     
@@ -191,11 +242,11 @@ class EnhancedUserRegistration(BaseModel):
             raise ValueError(f"Password must be at least {ValidationConfig.MIN_PASSWORD_LENGTH} characters")
         
         # Check for common password patterns
-        if v.lower() in ['password', '123456', 'qwerty', 'admin', 'user']:
+        if v.lower() in _COMMON_PASSWORDS:
             raise ValueError("Password is too common")
         
         # Require at least one number or special character
-        if not re.search(r'[0-9!@#$%^&*(),.?":{}|<>]', v):
+        if not _PASSWORD_CHAR_RE.search(v):
             raise ValueError("Password must contain at least one number or special character")
         
         return v
@@ -209,28 +260,22 @@ class EnhancedUserRegistration(BaseModel):
         return v
 
 
-class EnhancedTaskCreate(BaseModel):
-    """Enhanced task creation validation."""
-    title: str = Field(..., min_length=1, max_length=ValidationConfig.MAX_TITLE_LENGTH)
-    description: Optional[str] = Field(None, max_length=ValidationConfig.MAX_DESCRIPTION_LENGTH)
-    priority: TaskPriority = Field(default=TaskPriority.P2)
-    tags: List[str] = Field(default_factory=list, max_items=ValidationConfig.MAX_TAGS_COUNT)
-    dueStatus: TaskDueStatus = Field(default=TaskDueStatus.UPCOMING)
-    assignee: Optional[str] = Field(None, max_length=ValidationConfig.MAX_NAME_LENGTH)
-    project: Optional[str] = Field(None, max_length=ValidationConfig.MAX_NAME_LENGTH)
-    project_color: Optional[str] = Field(None, max_length=20)
-    category: Optional[str] = Field(None, max_length=ValidationConfig.MAX_NAME_LENGTH)
-    deadline: Optional[datetime] = None
+class _TaskFieldsMixin(BaseModel):
+    """Validators shared by the task creation and update models."""
     
-    @validator('title')
+    @field_validator('title', check_fields=False)
+    @classmethod
     def validate_title(cls, v):
+        if v is None:
+            return v
         v = sanitize_string(v)
         validate_no_html(v)
         if not v.strip():
             raise ValueError("Title cannot be empty")
         return v
     
-    @validator('description')
+    @field_validator('description', check_fields=False)
+    @classmethod
     def validate_description(cls, v):
         if v is None:
             return v
@@ -238,23 +283,38 @@ class EnhancedTaskCreate(BaseModel):
         validate_no_html(v)
         return v
     
-    @validator('tags')
+    @field_validator('tags', check_fields=False)
+    @classmethod
     def validate_tags(cls, v):
         if not v:
             return v
         
+        # Sanitize all tags in one pass; fall back to per-tag sanitizing when
+        # the separator is part of the input or a pattern spans two tags
+        tags = None
+        if not any(_TAG_SEPARATOR in tag for tag in v):
+            cleaned = sanitize_string(_TAG_SEPARATOR.join(v))
+            tags = [tag.strip() for tag in cleaned.split(_TAG_SEPARATOR)]
+        if tags is None or len(tags) != len(v):
+            tags = [sanitize_string(tag) for tag in v]
+        
+        try:
+            validate_no_html(_TAG_SEPARATOR.join(tags))
+        except ValueError:
+            for tag in tags:
+                validate_no_html(tag)
+        
         validated_tags = []
-        for tag in v:
-            tag = sanitize_string(tag)
-            validate_no_html(tag)
+        for tag in tags:
             if len(tag) > ValidationConfig.MAX_TAG_LENGTH:
                 raise ValueError(f"Tag '{tag}' is too long (max {ValidationConfig.MAX_TAG_LENGTH} characters)")
-            if tag.strip():
-                validated_tags.append(tag.strip())
+            if tag:
+                validated_tags.append(tag)
         
         return validated_tags
     
-    @validator('assignee')
+    @field_validator('assignee', check_fields=False)
+    @classmethod
     def validate_assignee(cls, v):
         if v is None:
             return v
@@ -262,7 +322,8 @@ class EnhancedTaskCreate(BaseModel):
         validate_no_html(v)
         return v
     
-    @validator('project')
+    @field_validator('project', check_fields=False)
+    @classmethod
     def validate_project(cls, v):
         if v is None:
             return v
@@ -270,7 +331,8 @@ class EnhancedTaskCreate(BaseModel):
         validate_no_html(v)
         return v
     
-    @validator('project_color')
+    @field_validator('project_color', check_fields=False)
+    @classmethod
     def validate_project_color(cls, v):
         if v is None:
             return v
@@ -278,7 +340,8 @@ class EnhancedTaskCreate(BaseModel):
             raise ValueError("Invalid color format")
         return v
     
-    @validator('category')
+    @field_validator('category', check_fields=False)
+    @classmethod
     def validate_category(cls, v):
         if v is None:
             return v
@@ -287,8 +350,26 @@ class EnhancedTaskCreate(BaseModel):
         return v
 
 
-class EnhancedTaskUpdate(BaseModel):
+class EnhancedTaskCreate(_TaskFieldsMixin):
+    """Enhanced task creation validation."""
+    model_config = ConfigDict(extra='forbid')
+    
+    title: str = Field(..., min_length=1, max_length=ValidationConfig.MAX_TITLE_LENGTH)
+    description: Optional[str] = Field(None, max_length=ValidationConfig.MAX_DESCRIPTION_LENGTH)
+    priority: TaskPriority = Field(default=TaskPriority.P2)
+    tags: List[str] = Field(default_factory=list, max_items=ValidationConfig.MAX_TAGS_COUNT)
+    dueStatus: TaskDueStatus = Field(default=TaskDueStatus.UPCOMING)
+    assignee: Optional[str] = Field(None, max_length=ValidationConfig.MAX_NAME_LENGTH)
+    project: Optional[str] = Field(None, max_length=ValidationConfig.MAX_NAME_LENGTH)
+    project_color: Optional[str] = Field(None, max_length=20)
+    category: Optional[str] = Field(None, max_length=ValidationConfig.MAX_NAME_LENGTH)
+    deadline: Optional[datetime] = None
+
+
+class EnhancedTaskUpdate(_TaskFieldsMixin):
     """Enhanced task update validation."""
+    model_config = ConfigDict(extra='forbid')
+    
     title: Optional[str] = Field(None, min_length=1, max_length=ValidationConfig.MAX_TITLE_LENGTH)
     description: Optional[str] = Field(None, max_length=ValidationConfig.MAX_DESCRIPTION_LENGTH)
     status: Optional[TaskStatus] = None
@@ -300,19 +381,12 @@ class EnhancedTaskUpdate(BaseModel):
     project_color: Optional[str] = Field(None, max_length=20)
     category: Optional[str] = Field(None, max_length=ValidationConfig.MAX_NAME_LENGTH)
     deadline: Optional[datetime] = None
-    
-    # Apply same validators as TaskCreate
-    _validate_title = validator('title', allow_reuse=True)(EnhancedTaskCreate.validate_title)
-    _validate_description = validator('description', allow_reuse=True)(EnhancedTaskCreate.validate_description)
-    _validate_tags = validator('tags', allow_reuse=True)(EnhancedTaskCreate.validate_tags)
-    _validate_assignee = validator('assignee', allow_reuse=True)(EnhancedTaskCreate.validate_assignee)
-    _validate_project = validator('project', allow_reuse=True)(EnhancedTaskCreate.validate_project)
-    _validate_project_color = validator('project_color', allow_reuse=True)(EnhancedTaskCreate.validate_project_color)
-    _validate_category = validator('category', allow_reuse=True)(EnhancedTaskCreate.validate_category)
 
 
 class EnhancedProjectCreate(BaseModel):
     """Enhanced project creation validation."""
+    model_config = ConfigDict(extra='forbid')
+    
     name: str = Field(..., min_length=1, max_length=ValidationConfig.MAX_NAME_LENGTH)
     description: Optional[str] = Field(None, max_length=ValidationConfig.MAX_DESCRIPTION_LENGTH)
     color: str = Field(default="blue", max_length=20)
@@ -343,6 +417,8 @@ class EnhancedProjectCreate(BaseModel):
 
 class EnhancedChatMessage(BaseModel):
     """Enhanced chat message validation."""
+    model_config = ConfigDict(extra='forbid')
+    
     message: str = Field(..., min_length=1, max_length=ValidationConfig.MAX_MESSAGE_LENGTH)
     
     @validator('message')
@@ -354,8 +430,24 @@ class EnhancedChatMessage(BaseModel):
         return v
 
 
+# File types accepted for upload
+_ALLOWED_EXTENSIONS = frozenset({'.pdf', '.doc', '.docx', '.txt', '.jpg', '.jpeg', '.png', '.gif', '.zip'})
+_ALLOWED_CONTENT_TYPES = frozenset({
+    'application/pdf',
+    'application/msword',
+    'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+    'text/plain',
+    'image/jpeg',
+    'image/png',
+    'image/gif',
+    'application/zip'
+})
+
+
 class EnhancedFileUpload(BaseModel):
     """Enhanced file upload validation."""
+    model_config = ConfigDict(extra='forbid')
+    
     filename: str = Field(..., min_length=1, max_length=255)
     content_type: str = Field(..., max_length=100)
     file_size: int = Field(..., gt=0, le=10*1024*1024)  # Max 10MB
@@ -366,26 +458,15 @@ class EnhancedFileUpload(BaseModel):
         validate_safe_filename(v)
         
         # Check file extension
-        allowed_extensions = ['.pdf', '.doc', '.docx', '.txt', '.jpg', '.jpeg', '.png', '.gif', '.zip']
-        if not any(v.lower().endswith(ext) for ext in allowed_extensions):
+        dot = v.rfind('.')
+        if dot < 0 or v[dot:].lower() not in _ALLOWED_EXTENSIONS:
             raise ValueError("File type not allowed")
         
         return v
     
     @validator('content_type')
     def validate_content_type(cls, v):
-        allowed_types = [
-            'application/pdf',
-            'application/msword',
-            'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
-            'text/plain',
-            'image/jpeg',
-            'image/png',
-            'image/gif',
-            'application/zip'
-        ]
-        
-        if v not in allowed_types:
+        if v not in _ALLOWED_CONTENT_TYPES:
             raise ValueError("Content type not allowed")
         
         return v
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+Shared login helper for the login test scripts.
+"""
+
+import atexit
+from typing import Any, Dict, Optional, Tuple
+
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Keep-alive session shared by every login script; one pooled connection per host
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_maxsize=8))
+SESSION.mount("https://", HTTPAdapter(pool_maxsize=8))
+atexit.register(SESSION.close)
+
+
+def run_login(
+    url: str,
+    creds: Dict[str, str],
+    session: requests.Session = SESSION,
+    timeout: float = 10
+) -> Tuple[requests.Response, Optional[Dict[str, Any]]]:
+    """POST credentials to a login endpoint; return the response and its parsed body on success."""
+    response = session.post(url, data=orjson.dumps(creds), headers=JSON_HEADERS, timeout=timeout)
+    data = orjson.loads(response.content) if response.status_code == 200 else None
+    return response, data
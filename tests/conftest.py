@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Shared pytest fixtures for the security test scripts.
+"""
+
+import base64
+import os
+import time
+from pathlib import Path
+
+import orjson
+import pytest
+import requests
+
+from . import test_cors_security, test_input_validation
+
+# Script modules that talk to a running backend through their BASE_URL
+LIVE_SERVER_MODULES = (test_cors_security, test_input_validation)
+
+# Test-only: reuse a still-valid login token across pytest runs so each run
+# does not cost a bcrypt verify on the server. Real logins are unaffected.
+TOKEN_CACHE = Path.home() / ".cache" / "kanban-tests" / "token.json"
+TOKEN_EXPIRY_MARGIN = 60  # seconds
+
+
+def _token_expiry(token: str) -> float:
+    """Read the JWT "exp" claim without verifying the signature (0 if unreadable)."""
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        return float(orjson.loads(base64.urlsafe_b64decode(payload))["exp"])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return 0
+
+
+def _load_cached_token():
+    """Cached token for BASE_URL, if there is one that has not expired."""
+    try:
+        cached = orjson.loads(TOKEN_CACHE.read_bytes())
+    except (OSError, ValueError):
+        return None
+    token = cached.get(test_input_validation.BASE_URL)
+    if token and _token_expiry(token) > time.time() + TOKEN_EXPIRY_MARGIN:
+        return token
+    return None
+
+
+def _store_token(token: str):
+    """
+    Write the token to the cache; replace atomically so parallel workers never
+    read a partial file. The file is owner-only since it holds a bearer token.
+    """
+    try:
+        TOKEN_CACHE.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        tmp = TOKEN_CACHE.with_suffix(f".{os.getpid()}.tmp")
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            f.write(orjson.dumps({test_input_validation.BASE_URL: token}))
+        os.replace(tmp, TOKEN_CACHE)
+    except OSError as e:
+        print(f"Failed to cache auth token: {e}")
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--base-url",
+        default=None,
+        help="Backend URL for the live-server tests (default: http://localhost:3001)"
+    )
+
+
+def pytest_configure(config):
+    base_url = config.getoption("--base-url")
+    if base_url:
+        for module in LIVE_SERVER_MODULES:
+            module.BASE_URL = base_url.rstrip("/")
+
+
+@pytest.fixture(scope="session")
+def server_ready():
+    """Probe the backend once per test session; skip the live-server tests if it is down."""
+    base_url = test_input_validation.BASE_URL
+    try:
+        response = requests.get(f"{base_url}/", timeout=5)
+    except requests.RequestException as e:
+        pytest.skip(f"Backend not reachable at {base_url}: {e}")
+    if response.status_code != 200:
+        pytest.skip(f"Backend at {base_url} returned status {response.status_code}")
+
+
+@pytest.fixture(scope="session")
+def auth_token(server_ready):
+    """Authentication token, fetched once per test session (or xdist worker)."""
+    # An explicitly provided token wins and is never written to disk
+    if os.getenv("KANBAN_TEST_TOKEN"):
+        return os.environ["KANBAN_TEST_TOKEN"]
+    token = _load_cached_token()
+    if token:
+        return token
+    token = test_input_validation.get_auth_token()
+    if not token:
+        pytest.skip("Cannot get auth token")
+    _store_token(token)
+    return token
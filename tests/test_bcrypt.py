@@ -3,8 +3,8 @@
 Test bcrypt password verification directly
 """
 import asyncio
+import bcrypt
 from motor.motor_asyncio import AsyncIOMotorClient
-from passlib.context import CryptContext
 from dotenv import load_dotenv
 import os
 
@@ -12,9 +12,13 @@ load_dotenv()
 
 async def test_password():
     """Test password verification"""
+    # Database connection; fail fast instead of waiting 30s when MongoDB is unreachable
+    client = AsyncIOMotorClient(
+        os.getenv("MONGODB_URL", "mongodb://localhost:27017"),
+        serverSelectionTimeoutMS=3000,
+        maxPoolSize=1
+    )
     try:
-        # Database connection
-        client = AsyncIOMotorClient(os.getenv("MONGODB_URL", "mongodb://localhost:27017"))
         db = client[os.getenv("DATABASE_NAME", "kanbanboard")]
         
         # Get user from database
@@ -27,9 +31,6 @@ async def test_password():
         print(f"  Email: {user['email']}")
         print(f"  Role: {user['role']}")
         
-        # Password context
-        pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-        
         # Test password
         test_password = "smb2025_beni!"
         stored_hash = user["password_hash"]
@@ -37,21 +38,22 @@ async def test_password():
         print(f"  Testing password: {test_password}")
         print(f"  Stored hash: {stored_hash[:50]}...")
         
-        # Verify password
-        is_valid = pwd_context.verify(test_password, stored_hash)
+        # Verify password (bcrypt directly; same result as the backend's passlib context)
+        is_valid = bcrypt.checkpw(test_password.encode("utf-8"), stored_hash.encode("utf-8"))
         print(f"  Password valid: {is_valid}")
         
         if is_valid:
             print("✅ Password verification successful")
         else:
             print("❌ Password verification failed")
-            
-        client.close()
         
     except Exception as e:
         print(f"❌ Error: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        # Motor's close() is synchronous; closing in finally covers the early returns too
+        client.close()
 
 if __name__ == "__main__":
     asyncio.run(test_password())
\ No newline at end of file
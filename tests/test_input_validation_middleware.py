@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the request validation middleware rules.
+Runs without a server; calls the path validators directly.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from input_validation_middleware import ValidationMiddleware  # noqa: E402
+
+INVALID_TASKS = (
+    {"title": "A" * 300},
+    {"title": "Task", "description": "B" * 2500},
+    {"title": "Task", "tags": ["tag"] * 15},
+    {"title": "Task", "tags": ["t" * 100]},
+    {"title": "   "},
+)
+
+
+@pytest.fixture(scope="module")
+def middleware():
+    return ValidationMiddleware(None)
+
+
+@pytest.mark.parametrize("task", INVALID_TASKS)
+def test_bulk_path_rejects_what_single_path_rejects(middleware, task):
+    """Every task the single create path rejects is also rejected inside a bulk request."""
+    single = middleware.validation_rules['/api/tasks'](task)
+    bulk = middleware.validation_rules['/api/tasks/bulk']([{"title": "Valid"}, task])
+    assert not single['valid']
+    assert not bulk['valid']
+    assert bulk['errors'] == [f"Task 1: {error}" for error in single['errors']]
+
+
+def test_bulk_path_accepts_valid_tasks(middleware):
+    """A list of valid tasks passes."""
+    result = middleware.validation_rules['/api/tasks/bulk']([{"title": "One"}, {"title": "Two", "tags": ["a"]}])
+    assert result == {'valid': True, 'errors': []}
+
+
+# Malformed emails, checked against the rule /api/auth/register goes through
+INVALID_EMAILS = (
+    "invalid-email",
+    "@domain.com",
+    "user@",
+    "user@domain",
+    "user.domain.com",
+    "user@domain..com",
+    "user@.domain.com",
+    "user@domain.c",
+    "user@domain.com.",
+    "user space@domain.com",
+)
+
+
+def _registration(email):
+    return {"username": "testuser", "email": email, "password": "SecurePass123!", "full_name": "Test User"}
+
+
+@pytest.mark.parametrize("email", INVALID_EMAILS)
+def test_registration_rejects_invalid_email(middleware, email):
+    """Malformed email addresses are rejected before reaching the register route."""
+    result = middleware.validation_rules['/api/auth/register'](_registration(email))
+    assert "Invalid email format" in result['errors']
+
+
+@pytest.mark.parametrize("email", ["user@example.com", "first.last+tag@mail.example.co.uk"])
+def test_registration_accepts_valid_email(middleware, email):
+    """Well-formed email addresses pass."""
+    result = middleware.validation_rules['/api/auth/register'](_registration(email))
+    assert result == {'valid': True, 'errors': []}
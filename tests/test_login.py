@@ -3,65 +3,74 @@
 Test login functionality with admin accounts
 """
 
-import requests
-import json
+import os
+import sys
 
-def test_login():
-    base_url = 'https://task.smb-ai-solution.com/api'
-    
-    # Test accounts from ADMIN_SETUP.md
-    test_accounts = [
-        {
-            'username': 'benedikt.thomas',
-            'password': 'smb2025_beni!',
-            'name': 'Benedikt Thomas'
-        },
-        {
-            'username': 'moritz.lange',
-            'password': 'smb2025_moritz!',
-            'name': 'Moritz Lange'
-        },
-        {
-            'username': 'simon.lange',
-            'password': 'smb2025_simon!',
-            'name': 'Simon Lange'
-        }
-    ]
-    
+import pytest
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from _login_driver import run_login  # noqa: E402
+
+LOGIN_URL = 'https://task.smb-ai-solution.com/api/auth/login'
+
+# Test accounts from ADMIN_SETUP.md
+TEST_ACCOUNTS = (
+    {
+        'username': 'benedikt.thomas',
+        'password': 'smb2025_beni!',
+        'name': 'Benedikt Thomas'
+    },
+    {
+        'username': 'moritz.lange',
+        'password': 'smb2025_moritz!',
+        'name': 'Moritz Lange'
+    },
+    {
+        'username': 'simon.lange',
+        'password': 'smb2025_simon!',
+        'name': 'Simon Lange'
+    }
+)
+
+def check_login(account) -> bool:
+    """Log in with one account and print the result."""
+    try:
+        response, user_data = run_login(
+            LOGIN_URL,
+            {'username': account['username'], 'password': account['password']}
+        )
+        
+        if user_data is not None:
+            print(f'✅ Login successful: {account["name"]}')
+            print(f'   Username: {user_data["user"]["username"]}')
+            print(f'   Email: {user_data["user"]["email"]}')
+            print(f'   Role: {user_data["user"]["role"]}')
+            print(f'   Token: {user_data["access_token"][:50]}...')
+            print()
+            return True
+        else:
+            print(f'❌ Login failed: {account["name"]}')
+            print(f'   Status: {response.status_code}')
+            print(f'   Error: {response.text}')
+            print()
+            
+    except Exception as e:
+        print(f'❌ Connection error for {account["name"]}: {str(e)}')
+        print()
+    return False
+
+@pytest.mark.parametrize('account', TEST_ACCOUNTS, ids=lambda account: account['username'])
+def test_login(account):
+    """Each admin account can log in."""
+    assert check_login(account)
+
+def main():
     print("Testing Admin Login Accounts...")
     print("=" * 50)
     
-    for account in test_accounts:
-        try:
-            login_data = {
-                'username': account['username'],
-                'password': account['password']
-            }
-            
-            response = requests.post(
-                f'{base_url}/auth/login',
-                json=login_data,
-                headers={'Content-Type': 'application/json'},
-                timeout=10
-            )
-            
-            if response.status_code == 200:
-                user_data = response.json()
-                print(f'✅ Login successful: {account["name"]}')
-                print(f'   Username: {user_data["user"]["username"]}')
-                print(f'   Email: {user_data["user"]["email"]}')
-                print(f'   Role: {user_data["user"]["role"]}')
-                print(f'   Token: {user_data["access_token"][:50]}...')
-                print()
-            else:
-                print(f'❌ Login failed: {account["name"]}')
-                print(f'   Status: {response.status_code}')
-                print(f'   Error: {response.text}')
-                print()
-                
-        except Exception as e:
-            print(f'❌ Connection error for {account["name"]}: {str(e)}')
-            print()
+    for account in TEST_ACCOUNTS:
+        check_login(account)
 
 if __name__ == "__main__":
-    test_login()
\ No newline at end of file
+    main()
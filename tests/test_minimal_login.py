@@ -2,7 +2,12 @@
 """
 Test minimal server login
 """
-import requests
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from _login_driver import run_login  # noqa: E402
 
 def test_login():
     url = 'http://localhost:8001/login'
@@ -15,12 +20,7 @@ def test_login():
     print("Testing minimal server login...")
     
     try:
-        response = requests.post(
-            url,
-            json=login_data,
-            headers={'Content-Type': 'application/json'},
-            timeout=10
-        )
+        response, _ = run_login(url, login_data)
         
         print(f"Status: {response.status_code}")
         print(f"Response: {response.text}")
@@ -34,4 +34,4 @@ def test_login():
         print(f"❌ Error: {e}")
 
 if __name__ == "__main__":
-    test_login()
\ No newline at end of file
+    test_login()
@@ -2,8 +2,12 @@
 """
 Simple test for login functionality 
 """
-import requests
-import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from _login_driver import run_login  # noqa: E402
 
 def test_login():
     url = 'http://localhost:8000/api/auth/login'
@@ -17,19 +21,13 @@ def test_login():
     print("Testing login with:", login_data)
     
     try:
-        response = requests.post(
-            url,
-            json=login_data,
-            headers={'Content-Type': 'application/json'},
-            timeout=10
-        )
+        response, data = run_login(url, login_data)
         
         print(f"Status: {response.status_code}")
         print(f"Response: {response.text}")
         
-        if response.status_code == 200:
+        if data is not None:
             print("✅ Login successful!")
-            data = response.json()
             print(f"User: {data.get('user', {}).get('username', 'N/A')}")
         else:
             print("❌ Login failed")
@@ -38,4 +36,4 @@ def test_login():
         print(f"❌ Error: {e}")
 
 if __name__ == "__main__":
-    test_login()
\ No newline at end of file
+    test_login()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the strict validation schemas.
+Runs without a server; exercises the Pydantic models directly.
+"""
+
+import os
+import sys
+
+import pytest
+from pydantic import ValidationError
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from validation_schemas import (  # noqa: E402
+    EnhancedFileUpload,
+    EnhancedTaskCreate,
+    EnhancedTaskUpdate,
+    sanitize_string,
+)
+
+
+def test_sanitize_string_strips_script_tags():
+    """Script blocks are removed and whitespace is normalized."""
+    assert sanitize_string("  Hello <script>alert(1)</script>  world ") == "Hello world"
+
+
+def test_task_update_applies_task_create_validators():
+    """EnhancedTaskUpdate sanitizes fields the same way as EnhancedTaskCreate."""
+    task = EnhancedTaskUpdate(title=" Fix   bug ", tags=[" backend ", ""])
+    assert task.title == "Fix bug"
+    assert task.tags == ["backend"]
+
+
+def test_task_update_allows_missing_fields():
+    """Omitted optional fields stay None."""
+    task = EnhancedTaskUpdate()
+    assert task.title is None
+    assert task.tags is None
+
+
+def test_task_update_rejects_invalid_color():
+    """Invalid project colors are rejected on update."""
+    with pytest.raises(ValidationError):
+        EnhancedTaskUpdate(project_color="not-a-color")
+
+
+def test_task_create_rejects_html_tags():
+    """HTML tags in tags are rejected."""
+    with pytest.raises(ValidationError):
+        EnhancedTaskCreate(title="Task", tags=["<b>bold</b>"])
+
+
+def test_tags_sanitized_like_individual_tags():
+    """Batched tag sanitizing matches sanitizing each tag on its own."""
+    tags = [" a  b ", "update x", "set y", "ok", "a<", ">b"]
+    task = EnhancedTaskCreate(title="Task", tags=tags)
+    expected = [sanitize_string(tag) for tag in tags]
+    assert task.tags == [tag for tag in expected if tag]
+
+
+def test_tags_containing_separator_are_sanitized_individually():
+    """Tags that contain the internal separator do not merge with their neighbours."""
+    task = EnhancedTaskCreate(title="Task", tags=["update a", "set\ue000b"])
+    assert task.tags == ["update a", "set\ue000b"]
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("Click JavaScript:alert(1)", "Click alert(1)"),
+    ("<ſcript>x</ſcript>", ""),
+    ("javaſcript:alert(1)", "alert(1)"),
+    ("jajavascript:vascript:", "javascript:"),
+    ("UNION Select * FROM users", "* FROM users"),
+])
+def test_sanitize_string_removes_patterns_ignoring_case(value, expected):
+    """Dangerous patterns are removed in any case, in a single pass."""
+    assert sanitize_string(value) == expected
+
+
+def test_unknown_fields_are_rejected():
+    """Enhanced models forbid fields they do not declare."""
+    with pytest.raises(ValidationError):
+        EnhancedTaskCreate(title="Task", owner="someone")
+
+
+def test_sanitize_string_removes_control_characters():
+    """Null bytes and control characters are removed, whitespace is normalized."""
+    assert sanitize_string("a\x00b\x07c\x7f\td\ne") == "abc d e"
+
+
+@pytest.mark.parametrize("filename, allowed", [
+    ("report.PDF", True),
+    ("archive.tar.zip", True),
+    ("notes.txt.exe", False),
+    ("pdf", False),
+])
+def test_file_upload_extension_check(filename, allowed):
+    """Only allowed file extensions are accepted, in any case."""
+    if allowed:
+        EnhancedFileUpload(filename=filename, content_type="text/plain", file_size=1)
+    else:
+        with pytest.raises(ValidationError):
+            EnhancedFileUpload(filename=filename, content_type="text/plain", file_size=1)